@@ -2,10 +2,18 @@
 import threading
 import time
 import math
+import re
+import heapq
+import bisect
+import array
+import queue
+import ctypes
+import atexit
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, Counter, deque
 from pprint import pformat
 from functools import partial
+from operator import attrgetter, itemgetter
 # gremlin (user plugin) imports
 import gremlin
 from gremlin.user_plugin import *
@@ -13,6 +21,7 @@ from gremlin.user_plugin import *
 import gremlin.joystick_handling
 import gremlin.input_devices
 import gremlin.control_action
+import gremlin.error
 import gremlin.event_handler
 from gremlin.spline import CubicSpline
 
@@ -21,17 +30,50 @@ from gremlin.spline import CubicSpline
 
 # class for each physical joystick device, for filtering and mapping
 class Device:
+    # slotted, since instances are long-lived and their attributes are read on every input event
+    __slots__ = ("mode", "physical_device", "physical_guid", "name", "label", "vjoy_id", "virtual_guid",
+                 "virtual_device", "settings", "press_callbacks", "release_callbacks",
+                 "physical_buttons", "virtual_buttons", "virtual_state", "axis_ids", "hat_ids",
+                 "latency", "logger", "events", "decorator")
+
     def __init__(self, physical_device, name, vjoy_id, mode, settings):
 
         self.mode = mode
         self.physical_device = physical_device
         self.physical_guid = self.physical_device._info.device_guid
         self.name = name
+        # mode/name prefix used by every per-device log line, formatted once
+        self.label = f"[{self.mode}] {self.name}"
         self.vjoy_id = vjoy_id
         self.virtual_guid = (gremlin.joystick_handling.vjoy_devices())[self.vjoy_id - 1].device_guid
         self.virtual_device = (gremlin.joystick_handling.VJoyProxy())[self.vjoy_id]
 
         self.settings = settings
+        # the Wait Time never changes after startup; hoist it out of the per-press
+        # settings.buttons.latency attribute chain
+        self.latency = settings.buttons.latency
+        # handles to the callback registries, to skip the nested dict lookup on every press
+        self.press_callbacks = settings.buttons.callbacks[1]
+        self.release_callbacks = settings.buttons.callbacks[0]
+        # pre-seed the registries for this device's button ids, so first-touch
+        # lookups on the hot path never fall into a defaultdict factory, and
+        # resolve every button's input/output proxy once instead of per event
+        self.physical_buttons = {}
+        self.virtual_buttons = {}
+        # last state written to each virtual button by this plugin, so a press and
+        # its release landing in the same drain (or a re-press of a held button)
+        # coalesce to one vjoy write instead of repeating the same state
+        self.virtual_state = {}
+        for btn in physical_device._buttons:
+            if btn:
+                self.press_callbacks.setdefault(btn._index, [])
+                self.release_callbacks.setdefault(btn._index, [])
+                self.physical_buttons[btn._index] = physical_device.button(btn._index)
+                self.virtual_buttons[btn._index] = self.virtual_device.button(btn._index)
+        # the raw gremlin input arrays carry None slots; filter them once here so every
+        # later (re-)initialization iterates just the real inputs
+        self.axis_ids = [aid for aid in physical_device._axis if aid]
+        self.hat_ids = [hat._index for hat in physical_device._hats if hat]
 
         # Initialize logging
         self.logger = Logger(self)
@@ -45,7 +87,7 @@ class Device:
         self.logger.ready(self)
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
+        return f"<Device {self.name} to VJoy #{self.vjoy_id} [{self.mode}]>"
 
     # set all the virtual inputs for this device to the current physical status
     def initialize_inputs(self, start_at_zero=False, first_time=False):
@@ -64,92 +106,139 @@ class Device:
     def initialize_buttons(self, initial_value=None, first_time=False):
         if first_time:
             self.logger.log("        ... Initializing buttons on " + self.name)
-        for btn in self.physical_device._buttons:
-            if btn:
-                # initialize value (to off if explicitly set; otherwise, current value)
-                value = initial_value
-                try:
-                    if value is None:
-                        value = self.get_button(btn._index)
-                    self.virtual_device.button(btn._index).is_pressed = value
-                except:
-                    self.logger.log("> Error initializing button " + str(btn._index) + " value")
-                else:
-                    # if this is the first time, set up the decorators
-                    if first_time:
-                        # add a decorator function for when that button is pressed
-                        @self.decorator.button(btn._index)
-                        # pass that info to the function that will check other button presses
-                        def callback(event, vjoy, joy):
-                            the_button = Button(event)
-                            if the_button.was_a_press:
-                                # add this button to the active_event
-                                self.events.start_tracking(the_button)
-                            else:
-                                # search for a matching press in the event log...
-                                # if it's far enough from this release, it's a legitimate release, and we should update
-                                # the button and execute the release callbacks
-                                if self.events.active_event.find_button(the_button):
-                                    the_button.connect_to_event(self.events.active_event)
-
-                                    # wait the duration of the delay Wait Time, then check for ghost inputs
-                            defer(self.settings.buttons.latency, self.filter_the_button, the_button, vjoy, joy)
+
+        # the filtering callback only depends on per-device state, so one function
+        # object (with every constant bound as a default) serves every button id —
+        # a 36-button device registers one closure, not 36
+        if first_time and self.settings.buttons.filter:
+            # pass that info to the function that will check other button presses
+            def filter_callback(event, vjoy, joy, events=self.events,
+                                physical_buttons=self.physical_buttons,
+                                virtual_buttons=self.virtual_buttons,
+                                virtual_state=self.virtual_state,
+                                max_concurrent=self.settings.buttons.max_concurrent):
+                # under a button-spam storm, shed raw presses before doing any work on
+                # them — the queue cap bounds both memory and worst-case drain latency.
+                # releases always get through: losing a press under overload is a
+                # shrug, but a shed release would leave the vjoy button latched
+                if event.is_pressed and len(events.pending) >= events.max_pending:
+                    events.dropped += 1
+                    return
+
+                # build the Button and enter it into the active event in one call
+                the_button = (events.register_press(event) if event.is_pressed
+                              else events.register_release(event))
+                # bind both device proxies from the init-time caches, so the deferred
+                # read/write is a single attribute load
+                the_button.physical_proxy = physical_buttons[the_button.identifier]
+                the_button.virtual_proxy = virtual_buttons[the_button.identifier]
+
+                # while contention is at or below the allowed threshold, relay the input
+                # right away, so the common lone press doesn't wait out the latency window.
+                # the deferred evaluation still runs, and retracts it if it proves a ghost
+                if len(events.active_event.buttons) <= max_concurrent:
+                    # the desired state may already be out (a quick re-press of a held
+                    # button); either way the relay has done its job
+                    if virtual_state.get(the_button.identifier) != the_button.was_a_press:
+                        the_button.virtual_proxy.is_pressed = the_button.was_a_press
+                        virtual_state[the_button.identifier] = the_button.was_a_press
+                    the_button.was_dispatched = True
+
+                # wait the duration of the delay Wait Time, then check for ghost inputs
+                # (batched, so a storm of presses shares one deferred drain)
+                self.queue_the_button(the_button, vjoy, joy)
+
+        for id in self.physical_buttons:
+            # initialize value (to off if explicitly set; otherwise, current value)
+            value = initial_value
+            try:
+                if value is None:
+                    value = self.get_button(id)
+                self.virtual_buttons[id].is_pressed = value
+                self.virtual_state[id] = value
+            except Exception:
+                self.logger.log("> Error initializing button " + str(id) + " value")
+            # register the decorators even if the initial write failed; a transient read
+            # error at startup shouldn't leave the button unmapped for the whole session
+            # (the filter setting never changes after startup, so register the
+            # specialized passthrough variant when filtering is off, rather than
+            # re-deciding on every single event)
+            if first_time and not self.settings.buttons.filter:
+                # resolve everything the passthrough needs once, at registration
+                virtual_button = self.virtual_buttons[id]
+                press_callbacks = self.press_callbacks[id]
+                release_callbacks = self.release_callbacks[id]
+
+                # add a decorator function for when that button is pressed
+                @self.decorator.button(id)
+                # with no filtering there's nothing to defer; relay the input and
+                # fire any custom callbacks straight away
+                def callback(event, vjoy, virtual_button=virtual_button,
+                             press_callbacks=press_callbacks, release_callbacks=release_callbacks):
+                    virtual_button.is_pressed = event.is_pressed
+                    for custom_callback in (press_callbacks if event.is_pressed else release_callbacks):
+                        custom_callback()
+
+            elif first_time:
+                # register the shared filtering callback for this button
+                self.decorator.button(id)(filter_callback)
 
     def initialize_axes(self, initial_value=None, first_time=False):
         if first_time:
             self.logger.log("        ... Initializing axes on " + self.name)
+        # pick the response transform once; the callbacks then apply it without re-checking the setting
+        transform = s_curve if self.settings.axes.curve else identity
         # by default, axes don't seem to map 1:1, so make sure VJoy devices has all 8 axes(?)
-        for aid in self.physical_device._axis:
-            if aid:
-                # set curve (perhaps later: customizable cubic spline? Filtering algorithm? Right now, 1:1 or S)
-                curve = CubicSpline([
-                    (-1.0, -1.0),
-                    (-0.5, -0.25),
-                    (0.0, 0.0),
-                    (0.5, 0.25),
-                    (1.0, 1.0)
-                ])
-
-                # initialize value
-                value = initial_value
-                try:
-                    if value is None:
-                        value = self.get_axis(aid)
-                    self.virtual_device.axis(aid).value = curve(value) if self.settings.axes.curve else value
-                except:
-                    self.logger.log("> Error initializing axis " + str(aid) + " value")
-                else:
-                    # if this is the first time, set up the decorators
-                    if first_time:
-                        # add a decorator function for when that axis is moved
-                        @self.decorator.axis(aid)
-                        def callback(event, vjoy):
-                            # Map the physical axis input to the virtual one
-                            vjoy[self.vjoy_id].axis(event.identifier).value = curve(
-                                event.value) if self.settings.axes.curve else event.value
+        for aid in self.axis_ids:
+            # initialize value
+            value = initial_value
+            try:
+                if value is None:
+                    value = self.get_axis(aid)
+                self.virtual_device.axis(aid).value = transform(value)
+            except Exception:
+                self.logger.log("> Error initializing axis " + str(aid) + " value")
+            # register the decorator even if the initial write failed
+            if first_time:
+                # resolve the output axis once; every sample then writes straight to it
+                virtual_axis = self.virtual_device.axis(aid)
+
+                # add a decorator function for when that axis is moved
+                @self.decorator.axis(aid)
+                def callback(event, vjoy, virtual_axis=virtual_axis, transform=transform,
+                             last_sent=[None]):
+                    # Map the physical axis input to the virtual one, but only cross
+                    # into vjoy when the value has actually moved; analog jitter
+                    # otherwise re-writes the same position at the hardware sample rate
+                    value = transform(event.value)
+                    previous = last_sent[0]
+                    if previous is None or abs(value - previous) >= axis_epsilon:
+                        last_sent[0] = value
+                        virtual_axis.value = value
 
     def initialize_hats(self, initial_value=None, first_time=False):
         if first_time:
             self.logger.log("        ... Initializing hats on " + self.name)
-        for hat in self.physical_device._hats:
-            if hat:
-                # initialize value
-                value = initial_value
-                try:
-                    if value is None:
-                        value = self.get_hat(hat._index)
-                    self.virtual_device.hat(hat._index).direction = value
-                except:
-                    self.logger.log("> Error initializing hat " + str(hat._index) + " value")
-                else:
-                    # if this is the first time, set up the decorators
-                    if first_time:
-                        # add a decorator function for when that hat is used
-                        @self.decorator.hat(hat._index)
-                        def callback(event, vjoy):
-                            # Map the physical hat input to the virtual one
-                            # (perhaps later: Filtering algorithm? Right now, 1:1)
-                            vjoy[self.vjoy_id].hat(event.identifier).direction = event.value
+        for id in self.hat_ids:
+            # initialize value
+            value = initial_value
+            try:
+                if value is None:
+                    value = self.get_hat(id)
+                self.virtual_device.hat(id).direction = value
+            except Exception:
+                self.logger.log("> Error initializing hat " + str(id) + " value")
+            # register the decorator even if the initial write failed
+            if first_time:
+                # resolve the output hat once; every event then writes straight to it
+                virtual_hat = self.virtual_device.hat(id)
+
+                # add a decorator function for when that hat is used
+                @self.decorator.hat(id)
+                def callback(event, vjoy, virtual_hat=virtual_hat):
+                    # Map the physical hat input to the virtual one
+                    # (perhaps later: Filtering algorithm? Right now, 1:1)
+                    virtual_hat.direction = event.value
 
     def get_button(self, id):
         return self.physical_device.button(id).is_pressed
@@ -160,11 +249,91 @@ class Device:
     def get_hat(self, id):
         return self.physical_device.hat(id).direction
 
+    # read the current physical state in one tight pass, without touching vjoy
+    def snapshot_inputs(self):
+        buttons = []
+        axes = []
+        hats = []
+        if self.settings.buttons.enabled:
+            for id, proxy in self.physical_buttons.items():
+                try:
+                    buttons.append((id, proxy.is_pressed))
+                except Exception:
+                    self.logger.log("> Error reading button " + str(id) + " value")
+        if self.settings.axes.enabled:
+            for aid in self.axis_ids:
+                try:
+                    axes.append((aid, self.get_axis(aid)))
+                except Exception:
+                    self.logger.log("> Error reading axis " + str(aid) + " value")
+        if self.settings.hats.enabled:
+            for hid in self.hat_ids:
+                try:
+                    hats.append((hid, self.get_hat(hid)))
+                except Exception:
+                    self.logger.log("> Error reading hat " + str(hid) + " value")
+        return buttons, axes, hats
+
+    # write a previously captured snapshot to the virtual device
+    def apply_snapshot(self, snapshot):
+        buttons, axes, hats = snapshot
+        transform = s_curve if self.settings.axes.curve else identity
+        for id, value in buttons:
+            try:
+                self.virtual_buttons[id].is_pressed = value
+                self.virtual_state[id] = value
+            except Exception:
+                self.logger.log("> Error initializing button " + str(id) + " value")
+        for aid, value in axes:
+            try:
+                self.virtual_device.axis(aid).value = transform(value)
+            except Exception:
+                self.logger.log("> Error initializing axis " + str(aid) + " value")
+        for hid, value in hats:
+            try:
+                self.virtual_device.hat(hid).direction = value
+            except Exception:
+                self.logger.log("> Error initializing hat " + str(hid) + " value")
+
+    # queue this button for ghost evaluation once its Wait Time is up
+    # presses that land while a drain is already pending ride along with it, instead of
+    # each scheduling their own deferred call
+    def queue_the_button(self, the_button, vjoy, joy):
+        self.queue_the_call(time.monotonic() + self.latency,
+                            self.filter_the_button, the_button, vjoy, joy)
+
+    # queue any deferred call onto the device's drain. every entry is appended with a
+    # deadline of now + Wait Time, so the queue stays sorted without a heap
+    def queue_the_call(self, deadline, func, *args):
+        self.events.pending.append((deadline, func, args))
+        if not self.events.drain_scheduled:
+            self.events.drain_scheduled = True
+            defer(max(deadline - time.monotonic(), 0), self.drain_the_buttons)
+
+    # run every queued call whose Wait Time has elapsed, in one pass
+    def drain_the_buttons(self):
+        now = time.monotonic()
+        pending = self.events.pending
+        try:
+            # consume from the front; other threads only ever append
+            while pending and pending[0][0] <= now:
+                deadline, func, args = pending.popleft()
+                func(*args)
+        finally:
+            # clear the flag even if a queued call blew up mid-drain, so the next
+            # append can always schedule a fresh drain
+            self.events.drain_scheduled = False
+            # anything left arrived mid-drain (or sits behind a failed call); schedule
+            # one follow-up for the oldest remainder
+            if pending:
+                self.events.drain_scheduled = True
+                defer(max(pending[0][0] - time.monotonic(), 0), self.drain_the_buttons)
+
     # checks total number of buttons pressed, every time a new button is pressed within the configured timespan
     # and maps the physical device to the virtual device if NOT a ghost input
     def filter_the_button(self, the_button, vjoy, joy):
         # get the current state (after this much delay)
-        the_button.is_still_pressed = joy[the_button.device_guid].button(the_button.identifier).is_pressed
+        the_button.is_still_pressed = the_button.physical_proxy.is_pressed
 
         # update the button's virtual timestamp and determine if is_ghost input
         the_button.evaluate_button(self)
@@ -172,20 +341,33 @@ class Device:
         # if this was initially a press
         if the_button.was_a_press:
             # it could still be part of an ongoing ghosting event, so wait the duration of the Wait Time delay and end monitoring.
-            # by then, enough time will have passed that this press should no longer be used to determine a Ghost Input
-            defer(self.settings.buttons.latency, self.events.end_tracking, the_button, self)
+            # by then, enough time will have passed that this press should no longer be used to determine a Ghost Input.
+            # rides the same drain queue as the evaluations, so it never costs its own wakeup during a burst
+            self.queue_the_call(time.monotonic() + self.latency,
+                                self.events.end_tracking, the_button, self)
 
         if not the_button.is_ghost:
-            # update the virtual button
-            vjoy[self.vjoy_id].button(the_button.identifier).is_pressed = the_button.is_still_pressed
+            # update the virtual button, unless this exact state already went out — the
+            # relay (or an earlier entry for the same button in this drain) may have
+            # written it, and the vjoy write is the expensive half of the evaluation
+            if self.virtual_state.get(the_button.identifier) != the_button.is_still_pressed:
+                the_button.virtual_proxy.is_pressed = the_button.is_still_pressed
+                self.virtual_state[the_button.identifier] = the_button.is_still_pressed
 
             # execute any decorated callbacks from custom code that match this keypress
             # via @device.on_virtual_press[/release](id)
-            callbacks = self.settings.buttons.callbacks['press' if the_button.is_still_pressed else 'release'].get(
+            callbacks = (self.press_callbacks if the_button.is_still_pressed else self.release_callbacks).get(
                 the_button.identifier)
             if callbacks:
                 for callback in callbacks:
                     callback()
+        elif the_button.was_dispatched:
+            # this input went out early but proved to be a ghost after all; retract it —
+            # back to released for a ghost press, back to pressed for a ghost release
+            retract_to = not the_button.was_a_press
+            if self.virtual_state.get(the_button.identifier) != retract_to:
+                the_button.virtual_proxy.is_pressed = retract_to
+                self.virtual_state[the_button.identifier] = retract_to
 
     # decorator for registering custom callbacks when a virtual button was successfully pressed or released
     def on_virtual_button(self, btns, events="press"):
@@ -193,10 +375,10 @@ class Device:
             if callback:
                 # for this/these button id(s)
                 for btn in btns if type(btns) is list else [btns]:
-                    # on this/these events(s) ("press"/"release")
+                    # on this/these events(s) ("press"/"release"), translated to the tuple index once here
                     for event in events if type(events) is list else [events]:
                         # add the decorated function into the callbacks for this button and event and add self to callback
-                        self.settings.buttons.callbacks[event][btn].append(callback)
+                        self.settings.buttons.callbacks[1 if event == "press" else 0][btn].append(callback)
 
         return wrap
 
@@ -208,11 +390,14 @@ class Device:
 
 
 class Logger:
+    # slotted like Device; instances live for the whole session and are read per event
+    __slots__ = ("enabled", "summary_key", "start_time")
+
     def __init__(self, the_device):
 
         self.enabled = the_device.settings.logging
         self.summary_key = the_device.settings.summary_key
-        self.start_time = time.localtime()
+        self.start_time = time.perf_counter()
 
         # log a summary every time summary button is pressed (user configurable)
         @gremlin.input_devices.keyboard(self.summary_key, the_device.mode)
@@ -223,7 +408,7 @@ class Logger:
         self.starting(the_device)
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
+        return f"<Logger enabled={self.enabled}>"
 
     def starting(self, the_device):
 
@@ -233,8 +418,8 @@ class Logger:
         # output general setup info
 
         log("")
-        log("  Remapping [" + the_device.mode + "] " + the_device.name, str(the_device.physical_guid))
-        log("     to VJoy #" + str(the_device.vjoy_id), str(the_device.virtual_guid))
+        log(f"  Remapping {the_device.label}", str(the_device.physical_guid))
+        log(f"     to VJoy #{the_device.vjoy_id}", str(the_device.virtual_guid))
         if the_device.settings.buttons.filter:
             log("        ... Button Filtering enabled")
         if the_device.settings.debug:
@@ -245,8 +430,7 @@ class Logger:
         if not self.enabled:
             return
 
-        log("          [" + the_device.mode + "] " + the_device.name + " to VJoy #" + str(
-            the_device.vjoy_id) + " is Ready!")
+        log(f"          {the_device.label} to VJoy #{the_device.vjoy_id} is Ready!")
 
     def summarize(self, the_device):
 
@@ -266,53 +450,74 @@ class Logger:
         events['percentage'] = ((totals['events']['blocked']['total'] + totals['events']['mixed'][
             'total']) / events['total']) * 100 \
             if events['total'] > 0 else 0.0  # !div/0
-        elapsed_time = time.mktime(time.localtime()) - time.mktime(self.start_time)
+        elapsed_time = time.perf_counter() - self.start_time
         inputs['per_minute'] = (totals['buttons']['blocked']['total'] / elapsed_time) * 60
         inputs['per_hour'] = inputs['per_minute'] * 60
         events['per_minute'] = ((totals['events']['blocked']['total'] + totals['events']['mixed']['total']) / elapsed_time) * 60
         events['per_hour'] = events['per_minute'] * 60
 
-        # output a summary
-        log("")
-        log("//////////////////////////////////////////////////////////////////")
-        log("   Summary for \"" + the_device.name + "\"", "on Profile [" + the_device.mode + "]")
-        log("   |      Elapsed Time", str(elapsed_time) + " seconds" + "   (" + str(
-            round(elapsed_time / 60, 1)) + " minutes)    (" + str(
-            round(elapsed_time / 3600, 1)) + " hours)")
-        log("   | ")
-        log("   |      Inputs       (Individual button press events)")
-        log("   |            Total Allowed", str(totals['buttons']['allowed']['total']))
-        log("   |            Total Blocked", str(totals['buttons']['blocked']['total']))
-        log("   |            Ghosting %", str(round(inputs['percentage'], 3)) + "%")
-        log("   |            Ghost Block rate", str(round(inputs['per_minute'], 3)) + "/min   (" + str(
-            round(inputs['per_hour'])) + "/hr)")
-        log("   | ")
-        log("   |      Events     (Grouped button presses that happened together)")
-        log("   |            Total Allowed", str(totals['events']['allowed']['total']))
-        log("   |            Total Blocked", str(totals['events']['blocked']['total']))
-        log("   |            Total Mixed", str(totals['events']['mixed']['total']))
-        log("   |            Ghosting %", str(round(events['percentage'], 3)) + "%")
-        log("   |            Ghost Block rate", str(round(events['per_minute'], 3)) + "/min   (" + str(
-            round(events['per_hour'])) + "/hr)")
+        # compose the whole summary locally, then hand it to the log queue as one
+        # record — a single put and a single write, instead of one per row
+        lines = []
+
+        def row(*args):
+            lines.append(format_columns(*args))
+
+        row("")
+        row("//////////////////////////////////////////////////////////////////")
+        row(f"   Summary for \"{the_device.name}\"", f"on Profile [{the_device.mode}]")
+        row("   |      Elapsed Time", f"{elapsed_time} seconds   "
+                                      f"({round(elapsed_time / 60, 1)} minutes)    "
+                                      f"({round(elapsed_time / 3600, 1)} hours)")
+        row("   | ")
+        row("   |      Inputs       (Individual button press events)")
+        row("   |            Total Allowed", str(totals['buttons']['allowed']['total']))
+        row("   |            Total Blocked", str(totals['buttons']['blocked']['total']))
+        if the_device.events.dropped:
+            row("   |            Total Dropped (overload)", str(the_device.events.dropped))
+        row("   |            Ghosting %", f"{round(inputs['percentage'], 3)}%")
+        row("   |            Ghost Block rate",
+            f"{round(inputs['per_minute'], 3)}/min   ({round(inputs['per_hour'])}/hr)")
+        row("   | ")
+        row("   |      Events     (Grouped button presses that happened together)")
+        row("   |            Total Allowed", str(totals['events']['allowed']['total']))
+        row("   |            Total Blocked", str(totals['events']['blocked']['total']))
+        row("   |            Total Mixed", str(totals['events']['mixed']['total']))
+        row("   |            Ghosting %", f"{round(events['percentage'], 3)}%")
+        row("   |            Ghost Block rate",
+            f"{round(events['per_minute'], 3)}/min   ({round(events['per_hour'])}/hr)")
 
         for event_type in ["blocked", "allowed"]:
             if totals['buttons'][event_type]['total'] > 0:
-                log("   | ")
-                log("   |      " + event_type.capitalize() + " Events")
-
-                def output_the_data(totals, event_type, metric):
-                    for key, cnt in sorted(totals[event_type][metric].items(), key=lambda item: item[1], reverse=True):
-                        log("   |                  " + str(key), str(int(math.ceil(cnt))))
-
-                log("   |            By Button")
+                row("   | ")
+                row(f"   |      {event_type.capitalize()} Events")
+
+                def output_the_data(totals, event_type, metric, fmt=str):
+                    data = totals[event_type][metric]
+                    # the flat per-button arrays enumerate by id; the counters carry their own keys
+                    items = enumerate(data) if type(data) is array.array else data.items()
+                    # bound each table to the 20 most common entries; the partial-sort heap
+                    # keeps a multi-hour session from sorting every combination it ever saw
+                    for key, cnt in heapq.nlargest(20, items, key=itemgetter(1)):
+                        # skip the pre-seeded zero entries
+                        if cnt > 0:
+                            row(f"   |                  {fmt(key)}", str(int(math.ceil(cnt))))
+
+                row("   |            By Button")
                 # output how many times each button was ghosted, starting with the most common one
-                output_the_data(totals['buttons'], event_type, 'by_button')
-                log("   |            By Simultaneity")
+                output_the_data(totals['buttons'], event_type, 'by_button',
+                                lambda id: "(Joy " + str(id) + ")")
+                row("   |            By Simultaneity")
                 # output how many buttons were triggered at the same time, starting with the most common number
-                output_the_data(totals['events'], event_type, 'by_simultaneity')
-                log("   |            By Combination")
+                output_the_data(totals['events'], event_type, 'by_simultaneity',
+                                lambda size: "(" + str(size) + " at once)")
+                row("   |            By Combination")
                 # output which combinations of buttons were pressed at the same time, starting with the most common
-                output_the_data(totals['events'], event_type, 'by_combination')
+                output_the_data(totals['events'], event_type, 'by_combination',
+                                lambda mask: "{" + ", ".join(
+                                    str(id) for id in range(1, mask.bit_length()) if mask >> id & 1) + "}")
+
+        log("\n".join(lines))
 
 
     def log(self, *args, **kwargs):
@@ -325,22 +530,39 @@ class Logger:
 
 # the running log of "Event" groups
 class Events:
+    # cap the pending queue; a runaway device spamming events past this is ghosting
+    # by definition, and unbounded deferrals would only stretch evaluation latency
+    max_pending = 256
+
     def __init__(self, the_device):
         self.enabled = the_device.settings.buttons.enabled
         self.active_event = Event()
+        # presses register on the input thread while tracking ends on the scheduler
+        # thread; the active-event bookkeeping has to change under one lock
+        self.lock = threading.Lock()
         self.last_event = None
         self.complete = EventList("complete")
+        # buttons waiting out their latency window before ghost evaluation
+        # (a deque: the input thread appends, the scheduler pops from the front, and
+        # both ends are O(1) C operations that are safe under the GIL)
+        self.pending = deque()
+        self.drain_scheduled = False
+        # raw events discarded because the pending queue was already full
+        self.dropped = 0
+        # button ids and simultaneity counts are small dense ints, so those tallies
+        # can be flat arrays indexed directly; labels are formatted at summary time
+        max_button = max((btn._index for btn in the_device.physical_device._buttons if btn), default=0)
         self.totals = {
             'events': {
                 'allowed': {
                     'total': 0,
-                    'by_simultaneity': defaultdict(int),
-                    'by_combination': defaultdict(int)
+                    'by_simultaneity': array.array('d', [0.0] * (max_button + 1)),
+                    'by_combination': Counter()
                 },
                 'blocked': {
                     'total': 0,
-                    'by_simultaneity': defaultdict(int),
-                    'by_combination': defaultdict(int)
+                    'by_simultaneity': array.array('d', [0.0] * (max_button + 1)),
+                    'by_combination': Counter()
                 },
                 'mixed': {
                     'total': 0
@@ -350,24 +572,33 @@ class Events:
             'buttons': {
                 'allowed': {
                     'total': 0,
-                    'by_button': defaultdict(int)
+                    'by_button': array.array('Q', [0] * (max_button + 1))
                 },
                 'blocked': {
                     'total': 0,
-                    'by_button': defaultdict(int)
+                    'by_button': array.array('Q', [0] * (max_button + 1))
                 }
             }
         }
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
-
-    def start_tracking(self, the_button):
-
-        if not self.enabled:
-            return
+        return f"<Events active_buttons={len(self.active_event.buttons)}>"
+
+    # build and track the Button for a physical press, in a single call from the input handler
+    def register_press(self, raw_event):
+        the_button = Button(raw_event)
+        if self.enabled:
+            with self.lock:
+                self.active_event.add_button(the_button)
+        return the_button
 
-        self.active_event.add_button(the_button)
+    # build the Button for a release, connecting it to the press it matches (if any)
+    def register_release(self, raw_event):
+        the_button = Button(raw_event)
+        if self.enabled and self.active_event.find_button(the_button):
+            # it's far enough from its press to be a legitimate release; tie it to that event
+            the_button.connect_to_event(self.active_event)
+        return the_button
 
     def end_tracking(self, the_button, the_device):
         if not self.enabled:
@@ -375,122 +606,158 @@ class Events:
 
         # flag this button as expired. It should no longer be used to determine ghost inputs
         the_button.expire()
-
-        # if this is the end of the ghosting event
-        if len(self.active_event.get_active_presses()) <= 0:
-            # update this event's totals
-            self.update_totals()
-
-            # output event to the log
-            self.active_event.flush_event(the_device)
-
-            # and reinitialize the active Event
-            self.active_event = Event()
-
-    # increment totals and update the in_progress event list with changes from active_event
-    def update_totals(self):
+        ended_event = None
+        with self.lock:
+            # only discount buttons the event is still tracking (a re-press may have replaced this one)
+            if self.active_event.buttons.get(the_button.identifier) is the_button:
+                self.active_event.active_mask &= ~(1 << the_button.identifier)
+            # if this is the end of the ghosting event, swap in a fresh Event before the
+            # lock drops — a press landing mid-flush starts the next event, rather than
+            # mutating the finished one while its buttons are being tallied
+            if self.active_event.active_mask == 0:
+                ended_event = self.active_event
+                self.active_event = Event()
+
+        if ended_event:
+            # update the finished event's totals
+            self.update_totals(ended_event)
+
+            # and output it to the log
+            ended_event.flush_event(the_device)
+
+    # increment totals from a finished event (already swapped out of active duty)
+    def update_totals(self, the_event):
         if not self.enabled:
             return
 
-        is_ghost = self.active_event.has_any()
-        is_heterogeneous = self.active_event.has_any(not is_ghost)
+        is_ghost = the_event.has_any()
+        is_heterogeneous = the_event.has_any(not is_ghost)
 
-        by_event = {
-            'allowed': {},
-            'blocked': {}
-        }
+        # resolve the nested tally dicts once; everything below indexes the locals
+        events_totals = self.totals['events']
+        buttons_totals = self.totals['buttons']
 
         # increment the event type
-        self.totals['events']["mixed" if is_heterogeneous else "blocked" if is_ghost else "allowed"]['total'] += 1
+        events_totals["mixed" if is_heterogeneous else "blocked" if is_ghost else "allowed"]['total'] += 1
 
-        # increment per button
-        for key, button in self.active_event.buttons.items():
-            button_type = "blocked" if button.is_ghost else "allowed"
-            self.totals['buttons'][button_type]['total'] += 1
-            self.totals['buttons'][button_type]['by_button']["(Joy " + str(key) + ")"] += 1
-            by_event[button_type][key] = button
+        # partition the event's buttons in one pass, then tally each side as a batch
+        ghost_keys = []
+        allowed_keys = []
+        for key, button in the_event.buttons.items():
+            (ghost_keys if button.is_ghost else allowed_keys).append(key)
 
-        # increment per allowed/blocked combination
-        for event_type, buttons in by_event.items():
-            combination = set(buttons.keys())
-            size = len(combination)
+        # per button and per allowed/blocked combination (keys stay cheap here; formatting happens at summary time)
+        for event_type, keys in (('blocked', ghost_keys), ('allowed', allowed_keys)):
+            size = len(keys)
 
             if size > 0:
-                self.totals['events'][event_type]['by_simultaneity']["(" + str(size) + " at once)"] += 1.0 / size
-                self.totals['events'][event_type]['by_combination'][str(combination)] += 1.0 / size
+                button_totals = buttons_totals[event_type]
+                event_totals = events_totals[event_type]
+                button_totals['total'] += size
+                by_button = button_totals['by_button']
+                for key in keys:
+                    by_button[key] += 1
+                event_totals['by_simultaneity'][size] += 1.0 / size
+                # combinations key on a bitmask of the button ids; an int hashes in C
+                # and needs no set allocation, and the summary decodes it at print time
+                combination = 0
+                for key in keys:
+                    combination |= 1 << key
+                event_totals['by_combination'][combination] += 1.0 / size
 
 
 class EventList:
+    # cap the history; oldest events fall off so long debug sessions don't grow without bound
+    max_events = 256
+
     def __init__(self, id):
         self.id = id
-        self.list = {}
+        self.list = deque(maxlen=self.max_events)
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
+        return f"<EventList {self.id} events={len(self.list)}>"
 
     def has_events(self):
         return len(self.list) > 0
 
     # search this event list for an event that intersects
     def find_similar_event(self, the_event):
-        for key, event in list(self.list.items()):
+        for event in self.list:
             # if any buttons in this combination are found in an event in this event list
             if set(event.buttons.keys()).intersection(set(the_event.buttons.keys())):
                 return event
         return None
 
     def add_event(self, the_event):
-        self.list[the_event.id] = the_event
+        self.list.append(the_event)
 
     def remove_event(self, the_event):
-        del self.list[the_event.id]
+        self.list.remove(the_event)
 
     def flush_events(self, the_device):
         if self.has_events():
             # for each event, generate an event message
-            for key, event in list(self.list.items()):
+            for event in self.list:
                 event.flush_event(the_device, event_list=self.id)
-                # delete the event from the list
-                self.remove_event(event)
+            # then clear the list in one go
+            self.list.clear()
 
 
 # a group of simultaneous Button presses
 class Event:
     def __init__(self, start_time=None, end_time=None, delta=None, id=None, buttons=None):
         self.start_time = start_time if start_time else datetime.now()
+        self.start_ts = time.monotonic()
         self.end_time = end_time if end_time else None
         self.delta = delta if delta else None
         self.id = id if id else self.start_time
         self.buttons = buttons if buttons else {}
-        self.threshold = globals()['settings'].buttons.latency * 4  # for flagging any events close together
+        # settings is bound at module bottom, long before any event fires; a plain
+        # global load (with 3.11's inline cache) beats indexing the globals() dict
+        self.threshold = settings.buttons.latency * 4  # for flagging any events close together
+        # (start_ts, identifier) index over the tracked buttons, for windowed separation checks
+        self.sorted_starts = sorted((b.start_ts, b.identifier) for b in self.buttons.values()) if buttons else []
+        # running verdict tallies, so has_any() is a counter check instead of a scan
+        self.ghost_count = 0
+        self.allowed_count = 0
+        # bitmask of tracked buttons that haven't expired yet (bit = identifier);
+        # set/clear are idempotent, so the count can't drift the way +=/-= could
+        self.active_mask = sum(1 << b.identifier for b in self.buttons.values() if not b.end_time) if buttons else 0
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
+        return f"<Event {self.id} buttons={len(self.buttons)}>"
 
     def has_any(self, is_ghost=True):
-        return any(button.is_ghost == is_ghost for button in self.buttons.values())
+        return (self.ghost_count if is_ghost else self.allowed_count) > 0
+
+    # tally a button verdict as it is evaluated
+    def record_verdict(self, the_button):
+        if the_button.is_ghost:
+            self.ghost_count += 1
+        else:
+            self.allowed_count += 1
 
     def has_matching(self, the_button, is_ghost=True):
         matching_button = self.buttons.get(the_button.identifier)
         return self.buttons[the_button.identifier].is_ghost == is_ghost if matching_button else False
 
     def is_all(self, is_ghost=True):
-        return all(button.is_ghost == is_ghost for button in self.buttons.values())
+        return (self.ghost_count if is_ghost else self.allowed_count) == len(self.buttons)
 
     def is_not_all(self, is_ghost=True):
-        return all(button.is_ghost != is_ghost for button in self.buttons.values())
+        return (self.ghost_count if is_ghost else self.allowed_count) == 0
 
     def is_event_within_threshold(self, last_event):
-        self.delta = self.start_time - last_event.start_time
-        return self.delta.total_seconds() < self.threshold if self.delta.total_seconds() > 0 else False
+        self.delta = self.start_ts - last_event.start_ts
+        return self.delta < self.threshold if self.delta > 0 else False
 
     def get_active_presses(self):
         # get a list of active buttons that haven't expired
-        return [key for key, button in set(sorted(self.buttons.items())) if not button.end_time]
+        return [key for key, button in self.buttons.items() if not button.end_time]
 
     def get_presses(self):
         # get a list of all buttons pressed in this event
-        return [key for key, button in set(sorted(self.buttons.items()))]
+        return list(self.buttons)
 
     def get_flag(self, last_event):
         pips = 0
@@ -498,9 +765,9 @@ class Event:
         # was this event very close to the previous event?
         if self.is_event_within_threshold(last_event):
             # map the seconds from 0 to <threshold> to 0 pips to <max_pips (5)> (inverted)
-            pips = int(map_value(self.delta.total_seconds(), (0.0, self.threshold), (5, 0)))
+            pips = int(delta_to_pips(self.delta))
             if pips:
-                flag += ("  ...Previous Event +" + str(round(max(self.delta.total_seconds() * 1000, 0))) + "ms")
+                flag += f"  ...Previous Event +{round(max(self.delta * 1000, 0))}ms"
         # were any of these buttons allowed during a ghosting event?
         if self.has_any():
             allowed = len([button.identifier for button in self.buttons.values() if not button.is_ghost])
@@ -508,26 +775,43 @@ class Event:
             # map the allowed/total ratio to 0 pips to <max_pips (5)>
             pips = int(map_value(allowed, (0.0, total), (0, 5)))
             if pips:
-                flag += ("  ..." + str(allowed) + " out of " + str(total) + " buttons triggered")
+                flag += f"  ...{allowed} out of {total} buttons triggered"
         if pips > 0:
-            flag += "  [" + ("*" * pips) + "]"
+            flag += f"  [{'*' * pips}]"
         if flag:
             flag += "  Possible Ghost Press Allowed?"
         return flag
 
     def find_button(self, the_button):
-        self.buttons.get(the_button.identifier)
+        return self.buttons.get(the_button.identifier)
 
     def add_button(self, the_button):
         # tell this button which event it's in
         the_button.connect_to_event(self)
+        # keep the start-time index in step with the tracked buttons
+        existing = self.buttons.get(the_button.identifier)
+        if existing is not None:
+            self.sorted_starts.remove((existing.start_ts, existing.identifier))
+            # the replaced button's verdict leaves with it (it was only recorded if the
+            # button was evaluated while it was still the tracked one), so the running
+            # counters never exceed the buttons the event actually holds
+            if existing.is_ghost is not None:
+                if existing.is_ghost:
+                    self.ghost_count -= 1
+                else:
+                    self.allowed_count -= 1
+        bisect.insort(self.sorted_starts, (the_button.start_ts, the_button.identifier))
         # add this button to the list of concurrent buttons
         self.buttons[the_button.identifier] = the_button
+        self.active_mask |= 1 << the_button.identifier
 
         return the_button
 
     def remove_button(self, the_button):
         del self.buttons[the_button.identifier]
+        self.sorted_starts.remove((the_button.start_ts, the_button.identifier))
+        if not the_button.end_time:
+            self.active_mask &= ~(1 << the_button.identifier)
 
     def update_event(self, the_button):
         # tell this button which event it's in
@@ -536,58 +820,63 @@ class Event:
         self.buttons[the_button.identifier] = the_button
 
     def merge_event(self, the_event):
-        self.buttons.update(dict(the_event.buttons))
-
-    def clone_event(self):
-        return Event(self.start_time, self.end_time, self.delta, self.id, dict(self.buttons))
+        self.buttons.update(the_event.buttons)
+        self.ghost_count += the_event.ghost_count
+        self.allowed_count += the_event.allowed_count
+        self.sorted_starts = sorted((b.start_ts, b.identifier) for b in self.buttons.values())
+        self.active_mask = sum(1 << b.identifier for b in self.buttons.values() if not b.end_time)
 
     def flush_event(self, the_device, event_list=None):
-        self.end_time = datetime.now()
+        self.end_time = time.monotonic()
 
         is_ghost_event = self.has_any(is_ghost=True)
+        # bail out before composing anything if no message can come of it
+        if not the_device.logger.enabled or not (is_ghost_event or the_device.settings.debug):
+            return
+
         # if ghosting event
         if is_ghost_event:
             msg = "> GHOST INPUTS blocked!"
         # if allowed event, and we're debugging verbosely
-        elif the_device.settings.debug:
-            if event_list is "complete":
-                msg = "   |            At " + str(self.start_time.strftime('%H:%M:%S.%f')[:-3]) + " ..... "
-            else:
-                msg = "> USER PRESS allowed:"
+        elif event_list == "complete":
+            msg = f"   |            At {self.start_time.strftime('%H:%M:%S.%f')[:-3]} ..... "
+        else:
+            msg = "> USER PRESS allowed:"
+
+        # build human-readable button breakdown string, one f-string per button
+        if the_device.settings.debug:
+            # abbreviated event codes (e.g. LGPB = Long Ghost Press Blocked) with trigger timestamps
+            buttons_string = [
+                f"Joy {id}: "
+                f"{'L' if button.is_still_pressed else 'S'}{'G' if button.is_ghost else ''}"
+                f"{'P' if button.was_a_press else 'R'}{'B' if button.is_ghost else 'A'}"
+                f" @ {button.trigger_time.strftime('%H:%M:%S.%f')[:-3]}"
+                for id, button in self.buttons.items()]
         else:
-            msg = False
-
-        # output a message (if we have one)
-        if msg:
-            # build human-readable button breakdown string
-            buttons_string = []
-            for id, button in self.buttons.items():
-                btn_str = ("long" if button.is_still_pressed else "short") + \
-                          (" ghost" if button.is_ghost else "") + \
-                          (" press" if button.was_a_press else " release ") + \
-                          (" blocked" if button.is_ghost else " allowed")
-                if the_device.settings.debug:
-                    # abbreviate event
-                    btn_str = ("".join([word[0].upper() for word in btn_str.split()])) + " @ " + str(
-                        button.trigger_time.strftime('%H:%M:%S.%f')[:-3])
-                buttons_string.append("Joy " + str(id) + ": " + btn_str)
-            breakdown = "(" + ("  |  ".join(buttons_string)) + ")"
-
-            # if debugging, compute difference to previous entry (to flag possible missed ghost inputs)
-            if the_device.events.last_event and the_device.settings.debug:
+            buttons_string = [
+                f"Joy {id}: {'long' if button.is_still_pressed else 'short'}"
+                f"{' ghost' if button.is_ghost else ''}"
+                f"{' press' if button.was_a_press else ' release '}"
+                f"{' blocked' if button.is_ghost else ' allowed'}"
+                for id, button in self.buttons.items()]
+        breakdown = "(" + ("  |  ".join(buttons_string)) + ")"
+
+        # if we're in debug mode, track the previous event (only debug output ever reads it)
+        if the_device.settings.debug:
+            # compute difference to previous entry (to flag possible missed ghost inputs)
+            if the_device.events.last_event:
                 # see if the difference is within the logging threshold and flag it
                 breakdown += self.get_flag(the_device.events.last_event)
-            the_device.events.last_event = self.clone_event()
+            # an event doesn't mutate once flushed, so keep the event itself rather than a copy
+            the_device.events.last_event = self
 
-            # if we're in debug mode
-            if the_device.settings.debug and event_list is not "complete" and not is_ghost_event:
+            if event_list != "complete" and not is_ghost_event:
                 # save all allowed events into [complete]
-                the_device.events.complete.add_event(self.clone_event())
+                the_device.events.complete.add_event(self)
 
-            # log the event
-            msg += " [" + the_device.mode + "] " + the_device.name + " pressed " + str(
-                len(self.buttons)) + " buttons at once"
-            the_device.logger.log(msg, breakdown, gutter=90)
+        # log the event
+        msg = f"{msg} {the_device.label} pressed {len(self.buttons)} buttons at once"
+        the_device.logger.log(msg, breakdown, gutter=90)
 
 
 # single button-press event
@@ -597,67 +886,80 @@ class Button:
         self.identifier = e.identifier
         self.device_guid = e.device_guid
         self.was_a_press = e.is_pressed
+        self.was_dispatched = False
         self.is_still_pressed = None
+        # bound input/output proxies, set by the owning device when the button is tracked
+        self.physical_proxy = None
+        self.virtual_proxy = None
         self.is_ghost = None
         self.type = None
-        self.start_time = datetime.now()
+        self.start_ts = time.monotonic()
         self.trigger_time = None
         self.end_time = None
         self.delta = None
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
+        return f"<Button {self.identifier} ghost={self.is_ghost}>"
 
     def connect_to_event(self, the_event):
         self.event_id = the_event.id
 
     def evaluate_button(self, the_device):
-        self.trigger_time = datetime.now()
+        # the trigger timestamp is only ever shown in debug breakdowns, so only build it then
+        if the_device.settings.debug:
+            self.trigger_time = datetime.now()
         self.is_ghost = self.is_ghost_press(the_device) if self.was_a_press else self.is_ghost_release(the_device)
 
+        # tally the verdict on the event this button belongs to — gated on identity,
+        # like end_tracking: a re-press may have replaced this button in the event,
+        # and a replaced button's verdict doesn't count
+        the_event = the_device.events.active_event
+        if the_event.buttons.get(self.identifier) is self:
+            the_event.record_verdict(self)
+
     def expire(self):
-        self.end_time = datetime.now()
+        self.end_time = time.monotonic()
 
-    # loop through all buttons in this event and see if any are too close together
+    # see if any other press in this event started within the minimum separation window
+    # (bisect over the event's sorted start times, instead of scanning every button)
     def is_button_within_threshold(self, the_device):
-        for id, button in the_device.events.active_event.buttons.items():
-            if button.identifier == self.identifier:
-                continue
-            delta = self.start_time - button.start_time
-            if abs(delta.total_seconds()) < the_device.settings.buttons.min_separation:
-                return True
-        return False
+        starts = the_device.events.active_event.sorted_starts
+        min_separation = the_device.settings.buttons.min_separation
+        lo = bisect.bisect_left(starts, (self.start_ts - min_separation,))
+        hi = bisect.bisect_right(starts, (self.start_ts + min_separation,))
+        return any(identifier != self.identifier for ts, identifier in starts[lo:hi])
 
     # ghost conditions for a press
+    # a ghost press if
+    # 1) filtering is enabled,
+    # 2) it's not still pressed as of now (if Strict Mode is off),
+    # 3) more than <max_concurrent> buttons are pressed at once
+    # and 4) it's very close to another button press in this event
+    # checked cheapest-first, so the common non-ghost cases bail out early
     def is_ghost_press(self, the_device):
         # filtering enabled?
-        is_filtering = the_device.settings.buttons.filter
+        if not the_device.settings.buttons.filter:
+            return False
         # multiple simultaneous buttons above threshold?
-        is_max_concurrent = len(the_device.events.active_event.buttons) > the_device.settings.buttons.max_concurrent
-        # is this press too close to any other presses in this event?
-        is_within_min_separation = self.is_button_within_threshold(the_device)
+        if len(the_device.events.active_event.buttons) <= the_device.settings.buttons.max_concurrent:
+            return False
         # could this be a legitimate long press (if strict mode is off)?
-        is_legitimate_long_press = self.is_still_pressed and not the_device.settings.buttons.is_strict
-        # a ghost press if
-        # 1) filtering is enabled,
-        # 2) more than <max_concurrent> buttons are pressed at once,
-        # 3) it's very close to another button press in this event
-        # and 4) it's not still pressed as of now (if Strict Mode is off)
-        return is_filtering and is_max_concurrent and is_within_min_separation and not is_legitimate_long_press
+        if self.is_still_pressed and not the_device.settings.buttons.is_strict:
+            return False
+        # is this press too close to any other presses in this event? (the only O(N) check, so it goes last)
+        return self.is_button_within_threshold(the_device)
 
     # ghost conditions for a release
+    # a ghost release if
+    # 1) filtering is enabled,
+    # 2) corresponds to a recent ghost press
     def is_ghost_release(self, the_device):
         # filtering enabled?
-        is_filtering = the_device.settings.buttons.filter
+        if not the_device.settings.buttons.filter:
+            return False
 
-        # get the matching press event, if exists
-        has_matching_ghost_press = the_device.events.active_event.has_matching(
-            the_button=self) if self.event_id else False
-
-        # a ghost release if
-        # 1) filtering is enabled,
-        # 2) corresponds to a recent ghost press
-        return is_filtering and has_matching_ghost_press
+        # does this release correspond to a recent ghost press?
+        return the_device.events.active_event.has_matching(the_button=self) if self.event_id else False
 
 
 class Settings:
@@ -670,7 +972,7 @@ class Settings:
         self.summary_key = summary_key
 
     def __repr__(self):
-        return "\n" + pformat(vars(self), indent=6, width=1)
+        return f"<Settings logging={self.logging} debug={self.debug}>"
 
     class Buttons:
         def __init__(self, enabled, filter, latency, max_concurrent, min_separation, is_strict):
@@ -680,10 +982,11 @@ class Settings:
             self.max_concurrent = max_concurrent
             self.min_separation = min_separation / 1000 if self.filter else 0
             self.is_strict = is_strict
-            self.callbacks = {'press': defaultdict(list), 'release': defaultdict(list)}
+            # indexed by was-it-a-press, so the hot path can use the bool directly: [0]=release, [1]=press
+            self.callbacks = (defaultdict(list), defaultdict(list))
 
         def __repr__(self):
-            return "\n" + pformat(vars(self), indent=6, width=1)
+            return f"<Settings.Buttons filter={self.filter}>"
 
     class Axes:
         def __init__(self, enabled, curve):
@@ -691,7 +994,7 @@ class Settings:
             self.curve = curve
 
         def __repr__(self):
-            return "\n" + pformat(vars(self), indent=6, width=1)
+            return f"<Settings.Axes curve={self.curve}>"
 
     class Hats:
 
@@ -699,27 +1002,165 @@ class Settings:
             self.enabled = enabled
 
         def __repr__(self):
-            return "\n" + pformat(vars(self), indent=6, width=1)
+            return f"<Settings.Hats enabled={self.enabled}>"
+
+
+# single long-lived worker that runs all deferred calls from a deadline heap
+# (a threading.Timer per event meant an OS thread created and torn down for every button press)
+class Scheduler:
+    def __init__(self):
+        self.tasks = []
+        self.counter = 0  # tie-breaker, so the heap never compares callables
+        self.condition = threading.Condition()
+        self.worker = threading.Thread(target=self.run, daemon=True)
+        self.worker.start()
+
+    def schedule(self, delay, func, args, kwargs):
+        with self.condition:
+            self.counter += 1
+            heapq.heappush(self.tasks, (time.monotonic() + delay, self.counter, func, args, kwargs))
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                if not self.tasks:
+                    self.condition.wait()
+                    continue
+                wait_time = self.tasks[0][0] - time.monotonic()
+                if wait_time > 0:
+                    self.condition.wait(wait_time)
+                    continue
+                deadline, counter, func, args, kwargs = heapq.heappop(self.tasks)
+            # run outside the lock, so callbacks can schedule more work; and guarded,
+            # so one failing call can't take down the only worker thread
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                log(f"> Error in deferred call {getattr(func, '__name__', func)}: {e}")
 
 
 # Functions
 
-# execute function after delay (via threading)
+scheduler = Scheduler()
+
+# Windows ticks at ~15.6ms by default, which quantizes every Condition.wait timeout the
+# scheduler relies on; pin the system timer to 1ms for as long as the plugin is loaded,
+# so a 35ms Wait Time is actually ~35ms rather than up to a tick and a half more
+try:
+    winmm = ctypes.WinDLL("winmm")
+    winmm.timeBeginPeriod(1)
+    atexit.register(winmm.timeEndPeriod, 1)
+except (AttributeError, OSError):
+    # not on Windows (or no winmm); everything still works, just at coarser resolution
+    winmm = None
+
+# shared axis response curve (perhaps later: customizable cubic spline? Filtering algorithm? Right now, 1:1 or S)
+s_curve_spline = CubicSpline([
+    (-1.0, -1.0),
+    (-0.5, -0.25),
+    (0.0, 0.0),
+    (0.5, 0.25),
+    (1.0, 1.0)
+])
+
+# the spline is fixed, so sample it once into a lookup table; each axis event then
+# costs one index computation and one array read instead of a spline evaluation
+s_curve_lut = array.array('d', (s_curve_spline(i / 1023 * 2 - 1) for i in range(1024)))
+
+
+def s_curve(value):
+    return s_curve_lut[min(int((value + 1.0) * 511.5), 1023)]
+
+
+# 1:1 transform, for when the smooth response curve is disabled
+def identity(value):
+    return value
+
+
+# smallest axis movement worth forwarding to vjoy (~one step of a 10-bit sensor)
+axis_epsilon = 1 / 1024
+
+
+# verbose object dump, for explicit debugging only (__repr__s are deliberately cheap)
+def debug_dump(obj):
+    attrs = vars(obj) if hasattr(obj, "__dict__") else {slot: getattr(obj, slot) for slot in obj.__slots__}
+    return "\n" + pformat(attrs, indent=6, width=1)
+
+
+# execute function after delay (via the shared scheduler thread)
 def defer(time, func, *args, **kwargs):
-    timer = threading.Timer(time, func, args, kwargs)
-    timer.start()
+    scheduler.schedule(time, func, args, kwargs)
 
 
-# write to log (optionally as ~two columns)
-def log(*args, gutter=80, **kwargs):
-    the_string = ""
+# format args into a single line (optionally as ~two columns)
+def format_columns(*args, gutter=80, **kwargs):
+    parts = []
     for i, arg in enumerate(args):
         if isinstance(arg, str):
-            the_string += (arg + " ").ljust(gutter, ".") if i == 0 and len(args) > 1 else arg
+            parts.append(f"{arg} ".ljust(gutter, ".") if i == 0 and len(args) > 1 else arg)
+        elif isinstance(arg, (int, float, bool)):
+            # scalars are the common case; str() skips pformat's PrettyPrinter machinery
+            parts.append(str(arg))
         else:
-            the_string += pformat(arg, **kwargs)
+            parts.append(pformat(arg, **kwargs))
+
+    return "".join(parts)
+
+
+# log records are handed off to a background thread, so neither the column
+# formatting nor the write itself ever runs on the input or scheduler threads
+log_queue = queue.Queue(maxsize=1024)
 
-    gremlin.util.log(the_string)
+
+def process_the_log_queue():
+    while True:
+        args, gutter, kwargs = log_queue.get()
+        lines = [format_columns(*args, gutter=gutter, **kwargs)]
+        # drain whatever else queued up in the meantime, so a burst lands as one write
+        try:
+            while True:
+                args, gutter, kwargs = log_queue.get_nowait()
+                lines.append(format_columns(*args, gutter=gutter, **kwargs))
+        except queue.Empty:
+            pass
+        gremlin.util.log("\n".join(lines))
+
+
+log_worker = threading.Thread(target=process_the_log_queue, daemon=True)
+log_worker.start()
+
+
+# write to log (optionally as ~two columns)
+def log(*args, gutter=80, **kwargs):
+    try:
+        log_queue.put_nowait((args, gutter, kwargs))
+    except queue.Full:
+        # logging is best-effort; drop the record rather than stall an input
+        pass
+
+
+# create the UI variables for one vjoy slot and publish them as top-level names
+# (because JG won't create the UI elements if simply stored in a list/dict.. must be top-level variables?)
+def publish_vjoy_ui(vjoy_id):
+    ui_mode = ModeVariable(f"VJoy #{vjoy_id}", "The mode to apply this filtering to")
+    ui_physical_device = PhysicalInputVariable(f"  -  Physical Device to map to VJoy #{vjoy_id}",
+                                               "Assign the physical device that should map to this device in the selected mode",
+                                               is_optional=True)
+    globals()[f"ui_mode_{vjoy_id}"] = ui_mode
+    globals()[f"ui_physical_device_{vjoy_id}"] = ui_physical_device
+    return ui_mode, ui_physical_device
+
+
+# parse a guid string into a GUID object, reusing previous parses (pure function of its input)
+guid_cache = {}
+
+
+def parse_guid_cached(guid_string):
+    the_guid = guid_cache.get(guid_string)
+    if the_guid is None:
+        the_guid = guid_cache[guid_string] = gremlin.profile.parse_guid(guid_string)
+    return the_guid
 
 
 # Scale the given value from the scale of src to the scale of dst.
@@ -727,13 +1168,39 @@ def map_value(val, src, dst):
     return ((clamp_value(val, *src) - src[0]) / (src[1] - src[0])) * (dst[1] - dst[0]) + dst[0]
 
 
+# build a mapper for a fixed src/dst pair, with the scale and offset folded in up front;
+# calling it is then one clamp and one multiply-add
+def make_mapper(src, dst):
+    # a degenerate source span (e.g. latency 0 with filtering off) maps everything
+    # to the start of the destination range, rather than dividing by zero
+    if src[1] == src[0]:
+        return lambda val: dst[0]
+
+    scale = (dst[1] - dst[0]) / (src[1] - src[0])
+    offset = dst[0] - src[0] * scale
+    lo, hi = src
+
+    def mapper(val):
+        return (val if lo <= val <= hi else lo if val < lo else hi) * scale + offset
+
+    return mapper
+
+
 # update all virtual devices with the current status from the physical devices
 def initialize_all_inputs():
     active_mode = gremlin.event_handler.EventHandler().active_mode
+    # snapshot every in-mode physical device first (a tight read-only pass), then write
+    # the virtual states, so a multi-device refresh doesn't interleave reads with vjoy writes
+    snapshots = []
     for id, device in globals()['filtered_devices'].items():
         # if the new mode matches this device's mode, use the physical device input status
         # otherwise; initialize inputs to 0
-        device.initialize_inputs(start_at_zero=active_mode != device.mode)
+        if active_mode != device.mode:
+            device.initialize_inputs(start_at_zero=True)
+        else:
+            snapshots.append((device, device.snapshot_inputs()))
+    for device, snapshot in snapshots:
+        device.apply_snapshot(snapshot)
 
 
 # switch modes and update all input states (synchronizes button states after a mode switch to prevent latching)
@@ -801,81 +1268,109 @@ settings = Settings(
     summary_key=ui_summary_key.value
 )
 
-vjoy_devices = sorted(gremlin.joystick_handling.vjoy_devices(), key=lambda x: x.vjoy_id)
+# pips mapper for the event-proximity flag, with the threshold scale folded in once
+delta_to_pips = make_mapper((0.0, settings.buttons.latency * 4), (5, 0))
+
+vjoy_devices = sorted(gremlin.joystick_handling.vjoy_devices(), key=attrgetter("vjoy_id"))
 filtered_devices = {}
-nicknames = defaultdict(list)
-
-log("+++++++++++++++++++++++++++++++++++++++++++++++++++++++++")
-log("")
-log("Ghost Input Filter", "Script starting")
-
-log("")
-log("   Ghost Presses tend to have the following characteristics:")
-log("      - Multiple buttons triggered simultaneously")
-log("      - Multiple buttons triggered very close together")
-log("      - Triggered buttons released immediately")
-log("   This plugin attempts to recognize those characteristics and actively block any presses that seem to match them.")
-log("   You can customize the parameters to distinguish between those symptoms and your actual, real button presses (based on you own play style).")
-
-log("")
-log("Current Settings:")
-log("   Button Filtering Threshold", str(settings.buttons.max_concurrent) + " buttons")
-log("   Button Filtering Wait Time", str(int(settings.buttons.latency * 1000)) + " millisecond evaluation buffer")
-log("   Button Filtering Minimum",
-    str(int(settings.buttons.min_separation * 1000)) + " millisecond button event separation")
-log("   Debugging mode", "Enabled" if settings.debug else "Disabled")
-if settings.debug:
-    log("      -   Event Code Descriptions")
-    log("              LGPB", "Long Ghost Press Blocked")
-    log("              SGPB", "Short Ghost Press Blocked")
-    log("              LGRB", "Long Ghost Release Blocked")
-    log("              SGRB", "Short Ghost Release Blocked")
-    log("              LPA", "Long Press Allowed")
-    log("              SPA", "Short Press Allowed")
-    log("              LRA", "Long Release Allowed")
-    log("              SRA", "Short Release Allowed")
-
-# Output VJoy configuration to log, to show Windows (GUIDs) <-> Joystick Gremlin (Vjoy IDs) assignment
-log("")
-log("The following VJoy devices were detected:")
-for vjoy in vjoy_devices:
-    log("   VJoy #" + str(vjoy.vjoy_id), str(vjoy.device_guid))
+# how many distinct devices have claimed each base nickname so far
+nickname_counts = {}
+# substring -> short name rules for generating device nicknames, compiled into a single scan
+nickname_pattern = re.compile("(stick|throttle)", re.IGNORECASE)
+nickname_labels = {"stick": "Stick", "throttle": "Throttle"}
+# guid -> nickname, so a device mapped to several vjoys is only classified once
+nickname_cache = {}
+
+# build the whole startup banner first, then write it in a single call (skipped entirely if logging is off)
+if settings.logging:
+    banner = [
+        "+++++++++++++++++++++++++++++++++++++++++++++++++++++++++",
+        "",
+        format_columns("Ghost Input Filter", "Script starting"),
+        "",
+        "   Ghost Presses tend to have the following characteristics:",
+        "      - Multiple buttons triggered simultaneously",
+        "      - Multiple buttons triggered very close together",
+        "      - Triggered buttons released immediately",
+        "   This plugin attempts to recognize those characteristics and actively block any presses that seem to match them.",
+        "   You can customize the parameters to distinguish between those symptoms and your actual, real button presses (based on you own play style).",
+        "",
+        "Current Settings:",
+        format_columns("   Button Filtering Threshold", str(settings.buttons.max_concurrent) + " buttons"),
+        format_columns("   Button Filtering Wait Time",
+                       str(int(settings.buttons.latency * 1000)) + " millisecond evaluation buffer"),
+        format_columns("   Button Filtering Minimum",
+                       str(int(settings.buttons.min_separation * 1000)) + " millisecond button event separation"),
+        format_columns("   Debugging mode", "Enabled" if settings.debug else "Disabled")
+    ]
+    if settings.debug:
+        banner.append("      -   Event Code Descriptions")
+        banner.append(format_columns("              LGPB", "Long Ghost Press Blocked"))
+        banner.append(format_columns("              SGPB", "Short Ghost Press Blocked"))
+        banner.append(format_columns("              LGRB", "Long Ghost Release Blocked"))
+        banner.append(format_columns("              SGRB", "Short Ghost Release Blocked"))
+        banner.append(format_columns("              LPA", "Long Press Allowed"))
+        banner.append(format_columns("              SPA", "Short Press Allowed"))
+        banner.append(format_columns("              LRA", "Long Release Allowed"))
+        banner.append(format_columns("              SRA", "Short Release Allowed"))
+
+    # Output VJoy configuration to log, to show Windows (GUIDs) <-> Joystick Gremlin (Vjoy IDs) assignment
+    banner.append("")
+    banner.append("The following VJoy devices were detected:")
+    for vjoy in vjoy_devices:
+        banner.append(format_columns(f"   VJoy #{vjoy.vjoy_id}", str(vjoy.device_guid)))
+
+    log("\n".join(banner))
 
 # Loop through vjoy devices
+# the proxy and guid parser are shared across slots; only configured slots pay for an actual device lookup
+joystick_proxy = gremlin.input_devices.JoystickProxy()
 for vjoy in vjoy_devices:
-    vjoy_id = str(vjoy.vjoy_id)
-
-    # create config for each one (because JG won't create the UI elements if simply stored in a list/dict.. must be top-level variables?)
-    vars()["ui_mode_" + vjoy_id] = (ModeVariable("VJoy #" + vjoy_id, "The mode to apply this filtering to"))
-    vars()["ui_physical_device_" + vjoy_id] = PhysicalInputVariable("  -  Physical Device to map to VJoy #" + vjoy_id,
-                                                                    "Assign the physical device that should map to this device in the selected mode",
-                                                                    is_optional=True)
-    # if we have a physical device set for this remapping
-    if vars()["ui_physical_device_" + vjoy_id].value is not None:
-        # grab config for each one
-        mode = vars()["ui_mode_" + vjoy_id].value
-        device_guid = str(vars()["ui_physical_device_" + vjoy_id].value['device_id'])
-
-        # create physical device proxy
-        device_proxy = (gremlin.input_devices.JoystickProxy())[gremlin.profile.parse_guid(device_guid)]
-
-        # generate a unique but shorter name for this device
+    vjoy_id = vjoy.vjoy_id
+
+    # create config for each one, bound to locals for all later reads
+    ui_mode, ui_physical_device = publish_vjoy_ui(vjoy_id)
+
+    # skip this slot if no physical device is set for this remapping
+    if ui_physical_device.value is None:
+        continue
+
+    # grab config for each one
+    mode = ui_mode.value
+    device_guid = str(ui_physical_device.value['device_id'])
+
+    # create physical device proxy
+    # a missing device (unplugged mid-session, USB hiccup) shouldn't abort setup for the remaining slots
+    try:
+        device_proxy = joystick_proxy[parse_guid_cached(device_guid)]
+    except gremlin.error.GremlinError as err:
+        log(f"> VJoy #{vjoy_id} skipped", str(err))
+        continue
+
+    # generate a unique but shorter name for this device (the same guid always resolves to the same nickname)
+    nickname = nickname_cache.get(device_guid)
+    if nickname is None:
         name = device_proxy._info.name
-        nickname = "Stick" if "stick" in name.lower() else "Throttle" if "throttle" in name.lower() else name
-        nickname = nickname if nickname not in nicknames or device_guid in nicknames[
-            nickname] else nickname + " " + str(len(nicknames[nickname]) + 1)
-        nicknames[nickname].append(device_guid)
-
-        # create a filtered device for each vjoy device that is getting remapped
-        # Initialize filtered device (which creates decorators to listen for and filter input)
-        device = Device(
-            device_proxy,
-            nickname,
-            int(vjoy_id),
-            mode,
-            settings
-        )
-        filtered_devices[int(vjoy_id)] = device
+        match = nickname_pattern.search(name)
+        nickname = nickname_labels[match.group(1).lower()] if match else name
+        # the guid cache guarantees each device is only classified once, so a
+        # per-nickname count is all the dedup needs
+        count = nickname_counts.get(nickname, 0) + 1
+        nickname_counts[nickname] = count
+        if count > 1:
+            nickname = nickname + " " + str(count)
+        nickname_cache[device_guid] = nickname
+
+    # create a filtered device for each vjoy device that is getting remapped
+    # Initialize filtered device (which creates decorators to listen for and filter input)
+    device = Device(
+        device_proxy,
+        nickname,
+        vjoy_id,
+        mode,
+        settings
+    )
+    filtered_devices[vjoy_id] = device
 
 # Custom Functions
 